@@ -4,13 +4,21 @@ AI Integration Test - Test actual AI functionality with mock authentication
 """
 
 import asyncio
-import httpx
+# Prefer the Rust-backed, API-compatible httpxr client when it is installed
+try:
+    import httpxr as httpx
+except ImportError:
+    import httpx
 import json
 from datetime import datetime, timezone
 
 BASE_URL = "https://sme-content-studio.preview.emergentagent.com/api"
 
-async def test_ai_with_mock_auth():
+async def probe(client: httpx.AsyncClient, payload: dict) -> httpx.Response:
+    """POST a payload to the content generation endpoint"""
+    return await client.post(f"{BASE_URL}/content/generate", json=payload)
+
+async def test_ai_with_mock_auth(client: httpx.AsyncClient):
     """Test AI functionality by bypassing auth temporarily"""
     print("🧪 Testing AI Integration with Direct Backend Access")
     print("=" * 50)
@@ -26,15 +34,16 @@ async def test_ai_with_mock_auth():
         "additional_details": "Free WiFi and study spaces available"
     }
     
+    flyer_data = {**test_data, "content_type": "flyer"}
+    
     try:
-        # Test without authentication first to see the error
-        print("Testing content generation endpoint...")
+        # Both probes are independent, so issue them concurrently
+        print("Testing content generation and flyer endpoints...")
         
-        async with httpx.AsyncClient(timeout=60) as client:
-            response = await client.post(
-                f"{BASE_URL}/content/generate",
-                json=test_data
-            )
+        response, flyer_response = await asyncio.gather(
+            probe(client, test_data),
+            probe(client, flyer_data)
+        )
         
         print(f"Response status: {response.status_code}")
         
@@ -61,19 +70,11 @@ async def test_ai_with_mock_auth():
             except:
                 print(f"Response text: {response.text}")
         
-        # Test flyer generation
-        print("\nTesting flyer generation with image...")
-        flyer_data = {**test_data, "content_type": "flyer"}
-        
-        async with httpx.AsyncClient(timeout=120) as client:
-            response = await client.post(
-                f"{BASE_URL}/content/generate",
-                json=flyer_data
-            )
+        # Check flyer generation
+        print("\nChecking flyer generation with image...")
+        print(f"Flyer response status: {flyer_response.status_code}")
         
-        print(f"Flyer response status: {response.status_code}")
-        
-        if response.status_code == 401:
+        if flyer_response.status_code == 401:
             print("✅ Flyer generation properly requires authentication")
         
         return True
@@ -83,7 +84,13 @@ async def test_ai_with_mock_auth():
         return False
 
 async def main():
-    await test_ai_with_mock_auth()
+    # One client for both probes so the TLS connection is kept alive and reused
+    async with httpx.AsyncClient(
+        timeout=120,
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=30)
+    ) as client:
+        await test_ai_with_mock_auth(client)
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -1,18 +1,30 @@
 from fastapi import FastAPI, APIRouter, HTTPException, Cookie, Depends, Header
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorGridFSBucket
+from bson import ObjectId
+from gridfs.errors import NoFile
+from pymongo import ReturnDocument
 import os
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable, Awaitable
 import uuid
-from datetime import datetime, timezone
-import base64
+import hashlib
+from functools import lru_cache
+from datetime import datetime, timezone, timedelta
 import asyncio
+# pybase64 provides a SIMD-accelerated, drop-in b64encode for large images
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
 import httpx
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from memoize.configuration import DefaultInMemoryCacheConfiguration
+from memoize.exceptions import CachedMethodFailedException
+from memoize.wrapper import memoize
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -22,8 +34,11 @@ mongo_url = os.environ['MONGO_URL']
 client = AsyncIOMotorClient(mongo_url)
 db = client[os.environ['DB_NAME']]
 
-# Create the main app
-app = FastAPI()
+# Generated images are stored in GridFS and referenced from content documents
+image_bucket = AsyncIOMotorGridFSBucket(db, bucket_name="content_images")
+
+# Create the main app; orjson serializes large image payloads much faster
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -37,6 +52,11 @@ except ImportError:
     AI_AVAILABLE = False
     print("AI integrations not available - install emergentintegrations")
 
+# AI configuration is read once at startup so misconfiguration shows up immediately
+EMERGENT_LLM_KEY = os.environ.get('EMERGENT_LLM_KEY')
+if AI_AVAILABLE and not EMERGENT_LLM_KEY:
+    print("EMERGENT_LLM_KEY not configured - AI content generation will fail")
+
 # Models
 class User(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -60,7 +80,8 @@ class GeneratedContent(BaseModel):
     content_type: str
     business_name: str
     text_content: str
-    image_base64: Optional[str] = None
+    image_base64: Optional[str] = None  # Only returned on generation, never stored
+    image_ref: Optional[str] = None  # GridFS file id of the generated image
     prompt_used: str
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
@@ -71,6 +92,30 @@ class Session(BaseModel):
     expires_at: datetime
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
+# Short-lived cache of session lookups so authenticated requests usually skip
+# MongoDB; concurrent requests with the same token share a single query
+SESSION_CACHE = DefaultInMemoryCacheConfiguration(
+    capacity=10_000,
+    method_timeout=timedelta(seconds=10),
+    update_after=timedelta(seconds=30),
+    expire_after=timedelta(seconds=30)
+)
+
+@memoize(configuration=SESSION_CACHE)
+async def lookup_session(token: str) -> Optional[str]:
+    """Resolve a session token to its user id, if the session is still valid"""
+    session = await db.sessions.find_one(
+        {
+            "session_token": token,
+            "expires_at": {"$gt": datetime.now(timezone.utc)}
+        },
+        {"user_id": 1, "_id": 0}
+    )
+    
+    if session:
+        return session["user_id"]
+    return None
+
 # Authentication dependency
 async def get_current_user(session_token: Optional[str] = Cookie(None), authorization: Optional[str] = Header(None)) -> Optional[str]:
     """Get current user from session token in cookie or authorization header"""
@@ -82,35 +127,15 @@ async def get_current_user(session_token: Optional[str] = Cookie(None), authoriz
         return None
     
     # Check if session exists and is valid
-    session = await db.sessions.find_one({
-        "session_token": token,
-        "expires_at": {"$gt": datetime.now(timezone.utc)}
-    })
-    
-    if session:
-        return session["user_id"]
-    return None
+    return await lookup_session(token)
 
-# AI Content Generation Functions
-async def generate_text_content(content_type: str, business_name: str, business_type: str, 
-                               target_audience: str, key_message: str, tone: str, 
-                               additional_details: str = None) -> tuple[str, str]:
-    """Generate text content using AI"""
-    if not AI_AVAILABLE:
-        return "AI not available", "sample prompt"
-    
-    try:
-        api_key = os.environ.get('EMERGENT_LLM_KEY')
-        if not api_key:
-            raise HTTPException(status_code=500, detail="AI API key not configured")
-        
-        # Create specialized prompts for each content type
-        prompts = {
-            "social_post": f"""Create an engaging social media post for {business_name}, a {business_type} business.
+# Prompt templates for each content type, formatted per request
+PROMPT_TEMPLATES: Dict[str, str] = {
+    "social_post": """Create an engaging social media post for {business_name}, a {business_type} business.
 Target audience: {target_audience}
 Key message: {key_message}
 Tone: {tone}
-Additional details: {additional_details or 'None'}
+Additional details: {additional_details}
 
 Requirements:
 - Maximum 280 characters for Twitter or 125 words for Facebook/LinkedIn
@@ -121,11 +146,11 @@ Requirements:
 
 Format the response as a ready-to-post social media update.""",
 
-            "flyer": f"""Create compelling flyer content for {business_name}, a {business_type} business.
+    "flyer": """Create compelling flyer content for {business_name}, a {business_type} business.
 Target audience: {target_audience}
 Key message: {key_message}
 Tone: {tone}
-Additional details: {additional_details or 'None'}
+Additional details: {additional_details}
 
 Requirements:
 - Eye-catching headline
@@ -137,11 +162,11 @@ Requirements:
 
 Format as structured flyer text with clear sections for headline, body, and contact info.""",
 
-            "radio_script": f"""Write a radio advertisement script for {business_name}, a {business_type} business.
+    "radio_script": """Write a radio advertisement script for {business_name}, a {business_type} business.
 Target audience: {target_audience}
 Key message: {key_message}
 Tone: {tone}
-Additional details: {additional_details or 'None'}
+Additional details: {additional_details}
 
 Requirements:
 - 30-second format (approximately 75 words)
@@ -153,11 +178,11 @@ Requirements:
 
 Format as a professional radio script with speaker directions.""",
 
-            "marketing_plan": f"""Create a comprehensive marketing plan for {business_name}, a {business_type} business.
+    "marketing_plan": """Create a comprehensive marketing plan for {business_name}, a {business_type} business.
 Target audience: {target_audience}
 Key message: {key_message}
 Tone: {tone}
-Additional details: {additional_details or 'None'}
+Additional details: {additional_details}
 
 Requirements:
 - Executive Summary
@@ -170,37 +195,111 @@ Requirements:
 - Next Steps
 
 Format as a structured business document with clear sections and actionable recommendations."""
-        }
-        
-        system_message = f"You are an expert marketing copywriter specializing in content for small and medium enterprises (SMEs). Create professional, engaging, and effective marketing content that drives results for local businesses."
-        
-        chat = LlmChat(
-            api_key=api_key,
-            session_id=str(uuid.uuid4()),
-            system_message=system_message
-        ).with_model("openai", "gpt-4o-mini")
+}
+
+SYSTEM_MESSAGE = "You are an expert marketing copywriter specializing in content for small and medium enterprises (SMEs). Create professional, engaging, and effective marketing content that drives results for local businesses."
+
+# Caches for completed AI generations. Identical prompts (retries, other users)
+# are served from memory, and concurrent identical calls share one upstream
+# request. update_after == expire_after so entries are never refreshed in the
+# background, which would re-bill the upstream API.
+TEXT_CACHE = DefaultInMemoryCacheConfiguration(
+    capacity=2048,
+    method_timeout=timedelta(minutes=2),
+    update_after=timedelta(hours=6),
+    expire_after=timedelta(hours=6)
+)
+# Images are raw PNGs of roughly 1-3 MB each, so at most 16 are kept
+# (about 50 MB per worker)
+IMAGE_CACHE = DefaultInMemoryCacheConfiguration(
+    capacity=16,
+    method_timeout=timedelta(minutes=3),
+    update_after=timedelta(hours=6),
+    expire_after=timedelta(hours=6)
+)
+
+def unwrap_cache_error(error: Exception) -> Exception:
+    """Return the original exception behind a memoize failure"""
+    if isinstance(error, CachedMethodFailedException) and error.__cause__:
+        return error.__cause__
+    return error
+
+@memoize(configuration=TEXT_CACHE)
+async def complete_prompt(system_message: str, prompt: str) -> str:
+    """Send a prompt to the LLM (memoized, failures are not cached)"""
+    # The API key is not a parameter so it never ends up in a cache key.
+    # The session id is derived from the prompt instead of drawing a fresh uuid4,
+    # so each distinct prompt still gets its own conversation.
+    session_id = hashlib.blake2b(
+        f"{system_message}\0{prompt}".encode(), digest_size=16
+    ).hexdigest()
+    chat = LlmChat(
+        api_key=EMERGENT_LLM_KEY,
+        session_id=session_id,
+        system_message=system_message
+    ).with_model("openai", "gpt-4o-mini")
+    
+    user_message = UserMessage(text=prompt)
+    return await chat.send_message(user_message)
+
+@lru_cache(maxsize=1)
+def get_image_generator() -> "OpenAIImageGeneration":
+    """Shared image generation client, created on first use"""
+    return OpenAIImageGeneration(api_key=EMERGENT_LLM_KEY)
+
+@memoize(configuration=IMAGE_CACHE)
+async def render_image(image_prompt: str) -> bytes:
+    """Generate a single image for a prompt (memoized, failures are not cached)"""
+    image_gen = get_image_generator()
+    images = await image_gen.generate_images(
+        prompt=image_prompt,
+        model="gpt-image-1",
+        number_of_images=1
+    )
+    
+    # Raise rather than return None, which memoize would cache as a result
+    if not images:
+        raise ValueError("no image returned")
+    return images[0]
+
+# AI Content Generation Functions
+async def generate_text_content(content_type: str, business_name: str, business_type: str, 
+                               target_audience: str, key_message: str, tone: str, 
+                               additional_details: str = None) -> tuple[str, str]:
+    """Generate text content using AI"""
+    if not AI_AVAILABLE:
+        return "AI not available", "sample prompt"
+    
+    if not EMERGENT_LLM_KEY:
+        raise HTTPException(status_code=500, detail="AI API key not configured")
+    
+    try:
+        # Only format the template for the requested content type
+        template = PROMPT_TEMPLATES.get(content_type, PROMPT_TEMPLATES["social_post"])
+        prompt = template.format(
+            business_name=business_name,
+            business_type=business_type,
+            target_audience=target_audience,
+            key_message=key_message,
+            tone=tone,
+            additional_details=additional_details or 'None'
+        )
         
-        user_message = UserMessage(text=prompts.get(content_type, prompts["social_post"]))
-        response = await chat.send_message(user_message)
+        response = await complete_prompt(SYSTEM_MESSAGE, prompt)
         
-        return response, prompts.get(content_type, prompts["social_post"])
+        return response, prompt
     
     except Exception as e:
+        e = unwrap_cache_error(e)
         logging.error(f"Error generating text content: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to generate content: {str(e)}")
 
-async def generate_image_content(business_name: str, business_type: str, content_description: str) -> Optional[str]:
-    """Generate image content using AI"""
-    if not AI_AVAILABLE:
+async def generate_image_content(business_name: str, business_type: str, content_description: str) -> Optional[bytes]:
+    """Generate image content using AI, returning the raw image bytes"""
+    if not AI_AVAILABLE or not EMERGENT_LLM_KEY:
         return None
     
     try:
-        api_key = os.environ.get('EMERGENT_LLM_KEY')
-        if not api_key:
-            return None
-        
-        image_gen = OpenAIImageGeneration(api_key=api_key)
-        
         # Create a detailed prompt for business imagery
         image_prompt = f"""Professional marketing image for {business_name}, a {business_type} business. 
 {content_description}
@@ -211,21 +310,56 @@ Layout: Suitable for flyers or social media posts
 Text space: Leave room for text overlay
 Brand-appropriate imagery that appeals to the target demographic"""
         
-        images = await image_gen.generate_images(
-            prompt=image_prompt,
-            model="gpt-image-1",
-            number_of_images=1
-        )
-        
-        if images and len(images) > 0:
-            image_base64 = base64.b64encode(images[0]).decode('utf-8')
-            return image_base64
-        return None
+        return await render_image(image_prompt)
     
     except Exception as e:
+        e = unwrap_cache_error(e)
         logging.error(f"Error generating image: {str(e)}")
         return None
 
+async def generate_request_content(request: ContentRequest) -> tuple[str, str, Optional[bytes]]:
+    """Generate the text, prompt and (for flyers) image bytes for a request"""
+    # Generate text content
+    text_task = generate_text_content(
+        request.content_type,
+        request.business_name,
+        request.business_type,
+        request.target_audience,
+        request.key_message,
+        request.tone,
+        request.additional_details
+    )
+    
+    # Generate image for flyers alongside the text, since the image prompt
+    # does not depend on the generated copy
+    image_bytes = None
+    if request.content_type == "flyer":
+        image_description = f"Create a professional flyer background for {request.business_name}, {request.business_type}. Target audience: {request.target_audience}. Message: {request.key_message}"
+        image_task = generate_image_content(
+            request.business_name,
+            request.business_type,
+            image_description
+        )
+        (text_content, prompt_used), image_bytes = await asyncio.gather(text_task, image_task)
+    else:
+        text_content, prompt_used = await text_task
+    
+    return text_content, prompt_used, image_bytes
+
+# Generations currently in flight, keyed by their request fields
+INFLIGHT_GENERATIONS: Dict[tuple, asyncio.Task] = {}
+
+async def coalesce(key: tuple, coro_factory: Callable[[], Awaitable[Any]]) -> Any:
+    """Run coro_factory once per key; concurrent callers with the same key await that run"""
+    task = INFLIGHT_GENERATIONS.get(key)
+    if task is None:
+        # The run is a task of its own and every caller awaits it through a
+        # shield, so a disconnecting caller never cancels it for the others
+        task = asyncio.create_task(coro_factory())
+        INFLIGHT_GENERATIONS[key] = task
+        task.add_done_callback(lambda _: INFLIGHT_GENERATIONS.pop(key, None))
+    return await asyncio.shield(task)
+
 # API Routes
 @api_router.get("/")
 async def root():
@@ -237,7 +371,7 @@ async def get_profile(user_id: str = Depends(get_current_user)):
     if not user_id:
         raise HTTPException(status_code=401, detail="Not authenticated")
     
-    user = await db.users.find_one({"id": user_id})
+    user = await db.users.find_one({"id": user_id}, {"_id": 0})
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -247,41 +381,57 @@ async def get_profile(user_id: str = Depends(get_current_user)):
 async def create_session(session_id: str = Header(..., alias="X-Session-ID")):
     """Create session from Emergent auth"""
     try:
-        # Call Emergent auth API
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                "https://demobackend.emergentagent.com/auth/v1/env/oauth/session-data",
-                headers={"X-Session-ID": session_id}
-            )
-            
-            if response.status_code != 200:
-                raise HTTPException(status_code=401, detail="Invalid session")
-            
-            user_data = response.json()
+        # Call Emergent auth API over the shared keep-alive client
+        response = await app.state.http.get(
+            "https://demobackend.emergentagent.com/auth/v1/env/oauth/session-data",
+            headers={"X-Session-ID": session_id}
+        )
+        
+        if response.status_code != 200:
+            raise HTTPException(status_code=401, detail="Invalid session")
+        
+        user_data = response.json()
+        
+        now = datetime.now(timezone.utc)
         
-        # Create or get user
-        existing_user = await db.users.find_one({"email": user_data["email"]})
-        if not existing_user:
-            user = User(
-                email=user_data["email"],
-                name=user_data["name"],
-                picture=user_data.get("picture")
-            )
-            await db.users.insert_one(user.dict())
-            user_id = user.id
-        else:
-            user_id = existing_user["id"]
+        # Create or get user in a single round-trip
+        user = User(
+            email=user_data["email"],
+            name=user_data["name"],
+            picture=user_data.get("picture"),
+            created_at=now
+        )
+        user_doc = await db.users.find_one_and_update(
+            {"email": user_data["email"]},
+            {"$setOnInsert": user.model_dump(mode="python")},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+            projection={"id": 1, "_id": 0}
+        )
+        user_id = user_doc["id"]
         
         # Create session
-        session = Session(
+        session = Session.model_construct(
+            id=str(uuid.uuid4()),
             user_id=user_id,
             session_token=user_data["session_token"],
-            expires_at=datetime.now(timezone.utc).replace(day=datetime.now(timezone.utc).day + 7)
+            expires_at=now + timedelta(days=7),
+            created_at=now
+        )
+        # Emergent returns the same token for a repeated session id, so upsert
+        # on it; a repeat login only refreshes the expiry
+        session_doc = session.model_dump(mode="python")
+        await db.sessions.update_one(
+            {"session_token": session.session_token},
+            {
+                "$set": {"expires_at": session_doc.pop("expires_at")},
+                "$setOnInsert": session_doc
+            },
+            upsert=True
         )
-        await db.sessions.insert_one(session.dict())
         
         # Set cookie and return user data
-        response = JSONResponse({
+        response = ORJSONResponse({
             "user": {
                 "id": user_id,
                 "email": user_data["email"],
@@ -313,8 +463,8 @@ async def generate_content(request: ContentRequest, user_id: str = Depends(get_c
         raise HTTPException(status_code=401, detail="Authentication required")
     
     try:
-        # Generate text content
-        text_content, prompt_used = await generate_text_content(
+        # Identical requests already in flight share one generation
+        key = (
             request.content_type,
             request.business_name,
             request.business_type,
@@ -323,28 +473,40 @@ async def generate_content(request: ContentRequest, user_id: str = Depends(get_c
             request.tone,
             request.additional_details
         )
+        text_content, prompt_used, image_bytes = await coalesce(
+            key, lambda: generate_request_content(request)
+        )
+        
+        content_id = str(uuid.uuid4())
         
-        # Generate image for flyers
+        # Store the image bytes in GridFS and keep only a reference in the document
         image_base64 = None
-        if request.content_type == "flyer":
-            image_description = f"Create a professional flyer background for {request.business_name}, {request.business_type}. Target audience: {request.target_audience}. Message: {request.key_message}"
-            image_base64 = await generate_image_content(
-                request.business_name,
-                request.business_type,
-                image_description
-            )
+        image_ref = None
+        if image_bytes:
+            file_id = await image_bucket.upload_from_stream(f"{content_id}.png", image_bytes)
+            image_ref = str(file_id)
+            image_base64 = base64.b64encode(image_bytes).decode('ascii')
         
-        # Save to database
-        content = GeneratedContent(
+        # Save to database; every field is server-generated, so skip validation
+        content = GeneratedContent.model_construct(
+            id=content_id,
             user_id=user_id,
             content_type=request.content_type,
             business_name=request.business_name,
             text_content=text_content,
             image_base64=image_base64,
-            prompt_used=prompt_used
+            image_ref=image_ref,
+            prompt_used=prompt_used,
+            created_at=datetime.now(timezone.utc)
         )
         
-        await db.generated_content.insert_one(content.dict())
+        try:
+            await db.generated_content.insert_one(content.model_dump(mode="python", exclude={"image_base64"}))
+        except Exception:
+            # Nothing references the uploaded image without its document
+            if image_ref:
+                await image_bucket.delete(ObjectId(image_ref))
+            raise
         return content
     
     except Exception as e:
@@ -357,11 +519,56 @@ async def get_content_history(user_id: str = Depends(get_current_user)):
     if not user_id:
         raise HTTPException(status_code=401, detail="Authentication required")
     
-    content_list = await db.generated_content.find(
-        {"user_id": user_id}
-    ).sort("created_at", -1).to_list(50)
+    # Images are served separately by /content/{id}/image, so documents stay small.
+    # Older documents embed the image inline; flag those with an "inline" ref so
+    # the client still requests them from the image endpoint.
+    # Documents come from our own inserts, so they are returned as-is and
+    # validated once by the response_model rather than rebuilt here first.
+    cursor = db.generated_content.aggregate([
+        {"$match": {"user_id": user_id}},
+        {"$sort": {"created_at": -1}},
+        {"$limit": 50},
+        {"$set": {"image_ref": {"$ifNull": [
+            "$image_ref",
+            {"$cond": [{"$ifNull": ["$image_base64", False]}, "inline", None]}
+        ]}}},
+        {"$project": {"_id": 0, "image_base64": 0}}
+    ], batchSize=50)
+    
+    return await cursor.to_list(50)
+
+@api_router.get("/content/{content_id}/image")
+async def get_content_image(content_id: str, user_id: str = Depends(get_current_user)):
+    """Get the image generated for a piece of content"""
+    if not user_id:
+        raise HTTPException(status_code=401, detail="Authentication required")
+    
+    content = await db.generated_content.find_one(
+        {"id": content_id, "user_id": user_id},
+        {"image_ref": 1, "image_base64": 1, "_id": 0}
+    )
+    if not content:
+        raise HTTPException(status_code=404, detail="Content not found")
+    
+    headers = {"Cache-Control": "private, max-age=86400"}
+    
+    if content.get("image_ref"):
+        try:
+            grid_out = await image_bucket.open_download_stream(ObjectId(content["image_ref"]))
+        except NoFile:
+            raise HTTPException(status_code=404, detail="Image not found")
+        
+        async def read_chunks():
+            while chunk := await grid_out.readchunk():
+                yield chunk
+        
+        return StreamingResponse(read_chunks(), media_type="image/png", headers=headers)
     
-    return [GeneratedContent(**content) for content in content_list]
+    # Documents created before GridFS storage keep the image inline
+    if content.get("image_base64"):
+        return Response(base64.b64decode(content["image_base64"]), media_type="image/png", headers=headers)
+    
+    raise HTTPException(status_code=404, detail="Image not found")
 
 @api_router.delete("/content/{content_id}")
 async def delete_content(content_id: str, user_id: str = Depends(get_current_user)):
@@ -369,14 +576,20 @@ async def delete_content(content_id: str, user_id: str = Depends(get_current_use
     if not user_id:
         raise HTTPException(status_code=401, detail="Authentication required")
     
-    result = await db.generated_content.delete_one({
-        "id": content_id,
-        "user_id": user_id
-    })
+    content = await db.generated_content.find_one_and_delete(
+        {"id": content_id, "user_id": user_id},
+        projection={"image_ref": 1, "_id": 0}
+    )
     
-    if result.deleted_count == 0:
+    if not content:
         raise HTTPException(status_code=404, detail="Content not found")
     
+    if content.get("image_ref"):
+        try:
+            await image_bucket.delete(ObjectId(content["image_ref"]))
+        except NoFile:
+            logging.warning(f"Image {content['image_ref']} for content {content_id} was already missing")
+    
     return {"message": "Content deleted successfully"}
 
 # Include the router in the main app
@@ -397,6 +610,39 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def ensure_indexes():
+    """Create the indexes backing the session, user and content queries"""
+    indexes = [
+        (db.sessions, "session_token", {"unique": True}),
+        (db.sessions, [("session_token", 1), ("expires_at", 1)], {}),
+        (db.users, "email", {"unique": True}),
+        (db.generated_content, [("user_id", 1), ("created_at", -1)], {}),
+        (db.generated_content, [("id", 1), ("user_id", 1)], {}),
+    ]
+    # Each index is built separately so one failure (e.g. duplicates left by
+    # older data blocking a unique index) does not prevent the rest
+    for collection, keys, options in indexes:
+        try:
+            await collection.create_index(keys, **options)
+        except Exception as e:
+            logger.error(f"Error creating index {keys} on {collection.name}: {str(e)}")
+
+@app.on_event("startup")
+async def init_http_client():
+    """Create the shared client used for outbound calls to the Emergent auth API"""
+    # Keep this on stock httpx: workers that never serve /auth/session close it
+    # unused, which aborts the process under httpxr
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        timeout=10,
+        limits=httpx.Limits(max_keepalive_connections=50, keepalive_expiry=60)
+    )
+
+@app.on_event("shutdown")
+async def shutdown_http_client():
+    await app.state.http.aclose()
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
     client.close()
\ No newline at end of file
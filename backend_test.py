@@ -4,22 +4,219 @@ Backend Testing Suite for AI Content & Marketing Studio
 Tests all backend API endpoints and functionality
 """
 
+import argparse
 import asyncio
+import contextvars
+import hashlib
 import httpx
 import json
+import random
+import statistics
+import sys
 import time
+from collections import defaultdict
+from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+
+# orjson is optional; it encodes request bodies several times faster than json
+try:
+    import orjson
+    json_bytes = orjson.dumps
+except ImportError:
+    def json_bytes(obj):
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+# uvloop is optional; it lowers event loop overhead during the concurrent fan-out
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 # Configuration
 BASE_URL = "https://sme-content-studio.preview.emergentagent.com/api"
-TIMEOUT = 120  # 2 minutes for image generation
+TIMEOUT = 120  # 2 minutes to read a generated response
+# Split budgets so a dead host fails on connect in seconds instead of
+# holding a phase for the whole read budget
+CLIENT_TIMEOUT = httpx.Timeout(connect=3.0, read=TIMEOUT, write=10.0, pool=5.0)
+IMAGE_TIMEOUT = httpx.Timeout(connect=3.0, read=180.0, write=10.0, pool=5.0)
+MAX_CONCURRENCY = 8  # Requests in flight at once against the shared preview host
+FIXTURES_PATH = Path(__file__).parent / "fixtures" / "backend_tests.json"
+# Banner of the phase running in the current task, used to key buffered log lines
+CURRENT_PHASE: contextvars.ContextVar[str] = contextvars.ContextVar("CURRENT_PHASE", default="")
+# Separator before the image field in the compact JSON of a generate response.
+# Quotes inside JSON strings are escaped, so this cannot occur in a text value.
+IMAGE_FIELD_MARKER = b',"image_base64":'
+RETRYABLE_STATUS_CODES = {429, 502, 503, 504}
+# Share of tests that must pass for the run to count as mostly working
+PASS_RATIO = 0.8
+# Summary labels for the boolean entries of the results dict
+TEST_NAMES = {
+    "ai_llm_integration": "AI LLM Integration",
+    "ai_image_generation": "AI Image Generation",
+    "emergent_auth": "Emergent Authentication",
+    "content_api_endpoints": "Content API Endpoints",
+    "database_storage": "Database Storage"
+}
+# Request bodies are pre-encoded and sent with content=, so set the type explicitly
+JSON_HEADERS = {"content-type": "application/json"}
+
+# Sample business data for content generation testing
+CONTENT_TEST_DATA = {
+    "business_name": "Sunrise Bakery",
+    "business_type": "Local Bakery & Cafe",
+    "target_audience": "Local families and coffee lovers",
+    "key_message": "Fresh baked goods daily with premium coffee",
+    "tone": "friendly",
+    "additional_details": "Family-owned for 15 years, specializing in artisan breads and pastries"
+}
+# Encoded once; each content type is patched into the sentinel slot
+CONTENT_TYPE_SENTINEL = b'"__CT__"'
+CONTENT_BODY_TEMPLATE = json_bytes({**CONTENT_TEST_DATA, "content_type": "__CT__"})
+
+# Expected outcomes per endpoint: status code -> (passed, message template).
+# The None entry covers any other status. Successful responses whose body
+# must be inspected are handled in the tests themselves.
+API_ROOT_EXPECTED = {
+    None: (False, "❌ API Root endpoint failed: {code}")
+}
+AUTH_SESSION_EXPECTED = {
+    422: (True, "✅ Auth session endpoint exists and validates headers"),
+    None: (False, "❌ Auth session endpoint unexpected response: {code}")
+}
+AUTH_PROFILE_EXPECTED = {
+    401: (True, "✅ Auth profile endpoint properly requires authentication"),
+    None: (False, "⚠️ Auth profile endpoint unexpected response: {code}")
+}
+CONTENT_GENERATE_EXPECTED = {
+    401: (True, "  ✅ {content_type}: Properly requires authentication"),
+    None: (False, "  ❌ {content_type}: HTTP {code}")
+}
+FLYER_GENERATE_EXPECTED = {
+    401: (True, "  ✅ Flyer generation properly requires authentication"),
+    None: (False, "  ❌ Flyer generation failed: HTTP {code} {reason}")
+}
+CONTENT_HISTORY_EXPECTED = {
+    401: (True, "  ✅ Content history properly requires authentication"),
+    None: (False, "  ❌ Content history failed: HTTP {code}")
+}
+CONTENT_DELETE_EXPECTED = {
+    401: (True, "  ✅ Content deletion properly requires authentication"),
+    404: (True, "  ✅ Content deletion handles missing content correctly"),
+    None: (False, "  ❌ Content deletion unexpected response: HTTP {code}")
+}
+CONTENT_IMAGE_EXPECTED = {
+    401: (True, "  ✅ Content image properly requires authentication"),
+    None: (False, "  ❌ Content image unexpected response: HTTP {code}")
+}
+INVALID_PAYLOAD_EXPECTED = {
+    422: (True, "  ✅ Database models validate input correctly"),
+    401: (True, "  ✅ Database operations require authentication"),
+    # Still considered working
+    None: (True, "  ⚠️ Unexpected response to invalid data: HTTP {code}")
+}
+
+def classify(table, response, **fields):
+    """Look up the expected outcome for a response; returns (passed, message)"""
+    passed, template = table.get(response.status_code, table[None])
+    return passed, template.format(code=response.status_code, reason=response.reason_phrase, **fields)
+
+async def with_retry(request_factory, attempts=3, base=0.25):
+    """Await request_factory(), retrying transient statuses with jittered backoff"""
+    for attempt in range(attempts):
+        response = await request_factory()
+        if response.status_code not in RETRYABLE_STATUS_CODES or attempt == attempts - 1:
+            return response
+        retry_after = response.headers.get("retry-after", "")
+        delay = float(retry_after) if retry_after.isdigit() else base * 2 ** attempt
+        await asyncio.sleep(delay + random.random() * base)
 
 class BackendTester:
-    def __init__(self):
+    def __init__(self, fixture_mode: Optional[str] = None, max_concurrency: int = MAX_CONCURRENCY):
         self.session_token = None
         self.user_id = None
         self.generated_content_ids = []
+        # Shared client so every test reuses pooled keep-alive connections;
+        # HTTP/2 lets the concurrent phases multiplex over one TLS connection
+        # The transport retries failed connection attempts; status-level retries
+        # are handled by with_retry
+        transport = httpx.AsyncHTTPTransport(
+            http2=True,
+            retries=3,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=60.0)
+        )
+        self.client = httpx.AsyncClient(
+            base_url=BASE_URL,
+            transport=transport,
+            timeout=CLIENT_TIMEOUT
+        )
+        # Request latencies in nanoseconds, keyed by "METHOD path"
+        self.latencies: Dict[str, List[int]] = defaultdict(list)
+        self.log_buf: Dict[str, List[str]] = defaultdict(list)
+        # Caps in-flight requests so concurrent phases do not trip rate limits
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        # Recorded probe responses: "record" saves them, "replay" serves them
+        # (falling back to the network), "lockdown" fails on any missing entry
+        self.fixture_mode = fixture_mode
+        self.fixtures: Dict[str, Dict[str, Any]] = {}
+        if fixture_mode in ("replay", "lockdown") and FIXTURES_PATH.exists():
+            self.fixtures = json.loads(FIXTURES_PATH.read_text())
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.client.aclose()
+        if self.fixture_mode == "record":
+            FIXTURES_PATH.parent.mkdir(exist_ok=True)
+            FIXTURES_PATH.write_text(json.dumps(self.fixtures, indent=2, sort_keys=True))
+    
+    async def send(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send a request over the network, within the concurrency cap"""
+        async with self.semaphore:
+            start = time.perf_counter_ns()
+            response = await self.client.request(method, path, **kwargs)
+            self.latencies[f"{method} {path}"].append(time.perf_counter_ns() - start)
+            return response
+    
+    async def http(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send a request, recording or replaying it from the fixture store"""
+        if not self.fixture_mode:
+            return await self.send(method, path, **kwargs)
+        
+        body = kwargs.get("content")
+        if body is None:
+            body = json.dumps(kwargs.get("json"), sort_keys=True).encode()
+        key = hashlib.sha256(f"{method} {path}\n".encode() + body).hexdigest()
+        
+        if self.fixture_mode in ("replay", "lockdown"):
+            fixture = self.fixtures.get(key)
+            if fixture is not None:
+                return httpx.Response(
+                    fixture["status_code"],
+                    headers={"content-type": fixture["content_type"]},
+                    content=fixture["body"].encode(),
+                    request=httpx.Request(method, self.client.base_url.join(path)),
+                    # Fixtures recorded before the version was stored report "unknown"
+                    extensions={
+                        "http_version": fixture.get("http_version", "unknown").encode(),
+                        "replayed": True
+                    }
+                )
+            if self.fixture_mode == "lockdown":
+                raise RuntimeError(f"No recorded fixture for {method} {path}")
+        
+        response = await self.send(method, path, **kwargs)
+        if self.fixture_mode == "record":
+            self.fixtures[key] = {
+                "method": method,
+                "path": path,
+                "status_code": response.status_code,
+                "http_version": response.http_version,
+                "content_type": response.headers.get("content-type", ""),
+                "body": response.text
+            }
+        return response
         
     async def run_all_tests(self):
         """Run all backend tests"""
@@ -36,148 +233,150 @@ class BackendTester:
             "warnings": []
         }
         
-        try:
-            # Test 1: Basic API connectivity
-            print("\n📡 Testing API Connectivity...")
-            await self.test_api_connectivity()
-            
-            # Test 2: Emergent Authentication Integration
-            print("\n🔐 Testing Emergent Authentication...")
-            auth_result = await self.test_authentication()
-            results["emergent_auth"] = auth_result
-            
-            # Test 3: AI LLM Integration for Content Generation
-            print("\n🤖 Testing AI LLM Content Generation...")
-            llm_result = await self.test_content_generation()
-            results["ai_llm_integration"] = llm_result
-            
-            # Test 4: AI Image Generation for Flyers
-            print("\n🎨 Testing AI Image Generation...")
-            image_result = await self.test_image_generation()
-            results["ai_image_generation"] = image_result
-            
-            # Test 5: Content API Endpoints
-            print("\n📋 Testing Content Management APIs...")
-            api_result = await self.test_content_apis()
-            results["content_api_endpoints"] = api_result
-            
-            # Test 6: Database Storage Verification
-            print("\n💾 Testing Database Storage...")
-            db_result = await self.test_database_storage()
-            results["database_storage"] = db_result
-            
-        except Exception as e:
-            results["errors"].append(f"Critical test failure: {str(e)}")
-            print(f"❌ Critical test failure: {str(e)}")
+        # (banner, results key, test); API connectivity is informational only
+        # and has no summary entry
+        phases = [
+            ("📡 Testing API Connectivity", None, self.test_api_connectivity),
+            ("🔐 Testing Emergent Authentication", "emergent_auth", self.test_authentication),
+            ("🤖 Testing AI LLM Content Generation", "ai_llm_integration", self.test_content_generation),
+            ("🎨 Testing AI Image Generation", "ai_image_generation", self.test_image_generation),
+            ("📋 Testing Content Management APIs", "content_api_endpoints", self.test_content_apis),
+            ("💾 Testing Database Storage", "database_storage", self.test_database_storage),
+        ]
+        
+        # The phases are independent, so run them concurrently; total time is
+        # bounded by the slowest phase (image generation) rather than the sum
+        outcomes = await asyncio.gather(
+            *(self.run_phase(banner, test) for banner, _, test in phases),
+            return_exceptions=True
+        )
+        
+        # Flush each phase's buffered log in declaration order
+        for (banner, key, _), outcome in zip(phases, outcomes):
+            lines = [f"\n{banner}...", *self.log_buf[banner]]
+            if isinstance(outcome, Exception):
+                results["errors"].append(f"Critical test failure: {str(outcome)}")
+                lines.append(f"❌ Critical test failure: {str(outcome)}")
+            elif key:
+                results[key] = outcome
+            sys.stdout.write("\n".join(lines) + "\n")
         
         # Print final results
         self.print_test_summary(results)
         return results
     
+    async def run_phase(self, banner, test):
+        """Run a test phase, buffering its log under the phase banner"""
+        # gather() runs each phase in its own task, so the context is per phase
+        CURRENT_PHASE.set(banner)
+        return await test()
+    
+    def log(self, line=""):
+        """Buffer a log line for the current phase; flushed after all phases finish"""
+        self.log_buf[CURRENT_PHASE.get()].append(line)
+    
     async def test_api_connectivity(self):
         """Test basic API connectivity"""
         try:
-            async with httpx.AsyncClient(timeout=30) as client:
-                response = await client.get(f"{BASE_URL}/")
-                
+            response = await self.http("GET", "/")
+            
             if response.status_code == 200:
                 data = response.json()
-                print(f"✅ API Root endpoint working: {data.get('message', 'No message')}")
+                self.log(f"✅ API Root endpoint working: {data.get('message', 'No message')}")
+                recorded = " (recorded)" if response.extensions.get("replayed") else ""
+                self.log(f"   Negotiated protocol: {response.http_version}{recorded}")
                 return True
-            else:
-                print(f"❌ API Root endpoint failed: {response.status_code}")
-                return False
+            
+            passed, message = classify(API_ROOT_EXPECTED, response)
+            self.log(message)
+            return passed
                 
         except Exception as e:
-            print(f"❌ API connectivity failed: {str(e)}")
+            self.log(f"❌ API connectivity failed: {str(e)}")
             return False
     
     async def test_authentication(self):
         """Test Emergent authentication integration"""
         try:
             # Test session creation endpoint (without actual Emergent session)
-            async with httpx.AsyncClient(timeout=30) as client:
-                # Test without session ID
-                response = await client.post(f"{BASE_URL}/auth/session")
-                
-            if response.status_code == 422:  # Expected validation error
-                print("✅ Auth session endpoint exists and validates headers")
-                
-                # Test profile endpoint without auth
-                async with httpx.AsyncClient(timeout=30) as client:
-                    response = await client.get(f"{BASE_URL}/auth/profile")
-                
-                if response.status_code == 401:
-                    print("✅ Auth profile endpoint properly requires authentication")
-                    return True
-                else:
-                    print(f"⚠️ Auth profile endpoint unexpected response: {response.status_code}")
-                    return False
-            else:
-                print(f"❌ Auth session endpoint unexpected response: {response.status_code}")
+            # Test without session ID
+            response = await self.http("POST", "/auth/session")
+            
+            # Expect a validation error for the missing header
+            passed, message = classify(AUTH_SESSION_EXPECTED, response)
+            self.log(message)
+            if not passed:
                 return False
+            
+            # Test profile endpoint without auth
+            response = await self.http("GET", "/auth/profile")
+            
+            passed, message = classify(AUTH_PROFILE_EXPECTED, response)
+            self.log(message)
+            return passed
                 
         except Exception as e:
-            print(f"❌ Authentication test failed: {str(e)}")
+            self.log(f"❌ Authentication test failed: {str(e)}")
             return False
     
     async def test_content_generation(self):
         """Test AI LLM content generation for all content types"""
         content_types = ["social_post", "flyer", "radio_script", "marketing_plan"]
         
-        # Sample business data for testing
-        test_data = {
-            "business_name": "Sunrise Bakery",
-            "business_type": "Local Bakery & Cafe",
-            "target_audience": "Local families and coffee lovers",
-            "key_message": "Fresh baked goods daily with premium coffee",
-            "tone": "friendly",
-            "additional_details": "Family-owned for 15 years, specializing in artisan breads and pastries"
-        }
+        # Each content type is an independent request, so issue them all at once
+        outcomes = await asyncio.gather(
+            *(self.check_content_type(content_type) for content_type in content_types)
+        )
         
         successful_tests = 0
-        
-        for content_type in content_types:
-            try:
-                print(f"  Testing {content_type} generation...")
-                
-                request_data = {**test_data, "content_type": content_type}
-                
-                async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-                    response = await client.post(
-                        f"{BASE_URL}/content/generate",
-                        json=request_data
-                    )
-                
-                if response.status_code == 401:
-                    print(f"  ✅ {content_type}: Properly requires authentication")
-                    successful_tests += 1
-                elif response.status_code == 200:
-                    data = response.json()
-                    if data.get("text_content") and data.get("content_type") == content_type:
-                        print(f"  ✅ {content_type}: Content generated successfully")
-                        successful_tests += 1
-                        if data.get("id"):
-                            self.generated_content_ids.append(data["id"])
-                    else:
-                        print(f"  ❌ {content_type}: Invalid response structure")
-                else:
-                    print(f"  ❌ {content_type}: HTTP {response.status_code}")
-                    
-            except Exception as e:
-                print(f"  ❌ {content_type}: Error - {str(e)}")
+        for content_type, ok, content_id in outcomes:
+            if ok:
+                successful_tests += 1
+            if content_id:
+                self.generated_content_ids.append(content_id)
         
         success_rate = successful_tests / len(content_types)
-        print(f"Content generation success rate: {successful_tests}/{len(content_types)} ({success_rate*100:.0f}%)")
+        self.log(f"Content generation success rate: {successful_tests}/{len(content_types)} ({success_rate*100:.0f}%)")
         
         return success_rate >= 0.75  # 75% success rate required
     
+    async def check_content_type(self, content_type):
+        """Generate one content type; returns (content_type, ok, content_id)"""
+        try:
+            self.log(f"  Testing {content_type} generation...")
+            
+            body = CONTENT_BODY_TEMPLATE.replace(CONTENT_TYPE_SENTINEL, json_bytes(content_type))
+            
+            response = await with_retry(lambda: self.http(
+                "POST",
+                "/content/generate",
+                content=body,
+                headers=JSON_HEADERS
+            ))
+            
+            if response.status_code == 200:
+                data = response.json()
+                if data.get("text_content") and data.get("content_type") == content_type:
+                    self.log(f"  ✅ {content_type}: Content generated successfully")
+                    return content_type, True, data.get("id")
+                self.log(f"  ❌ {content_type}: Invalid response structure")
+                return content_type, False, None
+            
+            passed, message = classify(CONTENT_GENERATE_EXPECTED, response, content_type=content_type)
+            self.log(message)
+            return content_type, passed, None
+            
+        except Exception as e:
+            self.log(f"  ❌ {content_type}: Error - {str(e)}")
+        
+        return content_type, False, None
+    
     async def test_image_generation(self):
         """Test AI image generation specifically for flyers"""
         try:
-            print("  Testing flyer with image generation (may take up to 1 minute)...")
+            self.log("  Testing flyer with image generation (may take up to 1 minute)...")
             
-            test_data = {
+            body = json_bytes({
                 "content_type": "flyer",
                 "business_name": "Green Valley Fitness",
                 "business_type": "Fitness Center & Gym",
@@ -185,119 +384,172 @@ class BackendTester:
                 "key_message": "Transform your body with our state-of-the-art equipment",
                 "tone": "motivational",
                 "additional_details": "New member special: 50% off first month"
-            }
+            })
             
-            start_time = time.time()
-            
-            async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-                response = await client.post(
-                    f"{BASE_URL}/content/generate",
-                    json=test_data
+            data, has_image = None, False
+            if self.fixture_mode:
+                # The suite is unauthenticated, so this probe only sees auth
+                # errors and is recorded and replayed like the others
+                start = time.perf_counter_ns()
+                response = await self.http(
+                    "POST", "/content/generate", content=body, headers=JSON_HEADERS, timeout=IMAGE_TIMEOUT
                 )
+                if response.status_code == 200:
+                    data = response.json()
+                    has_image = bool(data.get("image_base64"))
+                elapsed_ns = time.perf_counter_ns() - start
+            else:
+                # The response carries a large base64 image; it is streamed and
+                # abandoned once the fields checked below are known
+                async with self.semaphore:
+                    start = time.perf_counter_ns()
+                    async with self.client.stream(
+                        "POST", "/content/generate", content=body, headers=JSON_HEADERS, timeout=IMAGE_TIMEOUT
+                    ) as response:
+                        if response.status_code == 200:
+                            data, has_image = await self.read_flyer_fields(response)
+                    elapsed_ns = time.perf_counter_ns() - start
+                    self.latencies["POST /content/generate (flyer image)"].append(elapsed_ns)
             
-            elapsed_time = time.time() - start_time
-            print(f"  Image generation took {elapsed_time:.1f} seconds")
+            self.log(f"  Image generation took {elapsed_ns / 1e9:.1f} seconds")
             
-            if response.status_code == 401:
-                print("  ✅ Flyer generation properly requires authentication")
-                return True
-            elif response.status_code == 200:
-                data = response.json()
+            if response.status_code == 200:
                 if data.get("text_content") and data.get("content_type") == "flyer":
-                    print("  ✅ Flyer text content generated")
+                    self.log("  ✅ Flyer text content generated")
                     
                     # Check for image generation
-                    if data.get("image_base64"):
-                        print("  ✅ Flyer image generated successfully")
+                    if has_image:
+                        self.log("  ✅ Flyer image generated successfully")
                         if data.get("id"):
                             self.generated_content_ids.append(data["id"])
                         return True
                     else:
-                        print("  ⚠️ Flyer generated but no image (may be expected without auth)")
+                        self.log("  ⚠️ Flyer generated but no image (may be expected without auth)")
                         return True
                 else:
-                    print("  ❌ Invalid flyer response structure")
+                    self.log("  ❌ Invalid flyer response structure")
                     return False
-            else:
-                print(f"  ❌ Flyer generation failed: HTTP {response.status_code}")
-                return False
+            
+            passed, message = classify(FLYER_GENERATE_EXPECTED, response)
+            self.log(message)
+            return passed
                 
         except Exception as e:
-            print(f"  ❌ Image generation test failed: {str(e)}")
+            self.log(f"  ❌ Image generation test failed: {str(e)}")
             return False
     
+    async def read_flyer_fields(self, response):
+        """Read a generate response only up to its image; returns (fields, has_image)"""
+        buffer = b""
+        async for chunk in response.aiter_bytes():
+            buffer += chunk
+            index = buffer.find(IMAGE_FIELD_MARKER)
+            # Wait for the first byte of the image value to tell null from a string
+            if index != -1 and len(buffer) > index + len(IMAGE_FIELD_MARKER):
+                # Everything before the marker is a complete object once closed
+                fields = json.loads(buffer[:index] + b"}")
+                has_image = buffer[index + len(IMAGE_FIELD_MARKER):].startswith(b'"')
+                return fields, has_image
+        
+        # Field order differed from the server model; fall back to a full parse
+        data = json.loads(buffer)
+        return data, bool(data.get("image_base64"))
+    
     async def test_content_apis(self):
         """Test content management API endpoints"""
         try:
             # Test content history endpoint
-            print("  Testing content history retrieval...")
+            self.log("  Testing content history retrieval...")
             
-            async with httpx.AsyncClient(timeout=30) as client:
-                response = await client.get(f"{BASE_URL}/content/history")
+            response = await self.http("GET", "/content/history")
             
-            if response.status_code == 401:
-                print("  ✅ Content history properly requires authentication")
-            elif response.status_code == 200:
-                data = response.json()
+            if response.status_code == 200:
+                # An empty list is just "[]"; only decode bodies that can hold items
+                if int(response.headers.get("content-length", -1)) in (0, 2):
+                    data = []
+                else:
+                    data = response.json()
                 if isinstance(data, list):
-                    print(f"  ✅ Content history retrieved: {len(data)} items")
+                    self.log(f"  ✅ Content history retrieved: {len(data)} items")
                 else:
-                    print("  ❌ Content history invalid format")
+                    self.log("  ❌ Content history invalid format")
                     return False
             else:
-                print(f"  ❌ Content history failed: HTTP {response.status_code}")
-                return False
-            
-            # Test content deletion endpoint
-            print("  Testing content deletion...")
+                passed, message = classify(CONTENT_HISTORY_EXPECTED, response)
+                self.log(message)
+                if not passed:
+                    return False
             
             test_content_id = "test-content-id-123"
             
-            async with httpx.AsyncClient(timeout=30) as client:
-                response = await client.delete(f"{BASE_URL}/content/{test_content_id}")
+            # Test content image endpoint
+            self.log("  Testing content image retrieval...")
             
-            if response.status_code == 401:
-                print("  ✅ Content deletion properly requires authentication")
-                return True
-            elif response.status_code == 404:
-                print("  ✅ Content deletion handles missing content correctly")
-                return True
-            else:
-                print(f"  ❌ Content deletion unexpected response: HTTP {response.status_code}")
+            response = await self.http("GET", f"/content/{test_content_id}/image")
+            
+            passed, message = classify(CONTENT_IMAGE_EXPECTED, response)
+            self.log(message)
+            if not passed:
                 return False
+            
+            # Test content deletion endpoint
+            self.log("  Testing content deletion...")
+            
+            response = await self.http("DELETE", f"/content/{test_content_id}")
+            
+            passed, message = classify(CONTENT_DELETE_EXPECTED, response)
+            self.log(message)
+            return passed
                 
         except Exception as e:
-            print(f"  ❌ Content API test failed: {str(e)}")
+            self.log(f"  ❌ Content API test failed: {str(e)}")
             return False
     
     async def test_database_storage(self):
         """Test database models and storage functionality"""
         try:
-            print("  Testing database connectivity and models...")
+            self.log("  Testing database connectivity and models...")
             
             # Test that endpoints expect proper data structures
-            invalid_data = {"invalid": "data"}
+            body = json_bytes({"invalid": "data"})
             
-            async with httpx.AsyncClient(timeout=30) as client:
-                response = await client.post(
-                    f"{BASE_URL}/content/generate",
-                    json=invalid_data
-                )
+            response = await self.http(
+                "POST",
+                "/content/generate",
+                content=body,
+                headers=JSON_HEADERS
+            )
             
-            if response.status_code == 422:  # Validation error expected
-                print("  ✅ Database models validate input correctly")
-                return True
-            elif response.status_code == 401:
-                print("  ✅ Database operations require authentication")
-                return True
-            else:
-                print(f"  ⚠️ Unexpected response to invalid data: HTTP {response.status_code}")
-                return True  # Still consider this working
+            passed, message = classify(INVALID_PAYLOAD_EXPECTED, response)
+            self.log(message)
+            return passed
                 
         except Exception as e:
-            print(f"  ❌ Database storage test failed: {str(e)}")
+            self.log(f"  ❌ Database storage test failed: {str(e)}")
             return False
     
+    def print_latency_summary(self):
+        """Print avg/median/P95/P99 latency per endpoint, slowest P95 first"""
+        if not self.latencies:
+            return
+        
+        rows = []
+        for endpoint, samples in self.latencies.items():
+            ms = [sample / 1e6 for sample in samples]
+            # quantiles() needs two samples; a single sample is its own percentile
+            if len(ms) > 1:
+                cuts = statistics.quantiles(ms, n=100, method="inclusive")
+                p95, p99 = cuts[94], cuts[98]
+            else:
+                p95 = p99 = ms[0]
+            rows.append((endpoint, len(ms), statistics.fmean(ms), statistics.median(ms), p95, p99))
+        rows.sort(key=lambda row: row[4], reverse=True)
+        
+        print(f"\n⏱️ LATENCY (ms)")
+        print(f"{'Endpoint':<40} {'n':>3} {'avg':>9} {'median':>9} {'P95':>9} {'P99':>9}")
+        for endpoint, count, avg, median, p95, p99 in rows:
+            print(f"{endpoint:<40} {count:>3} {avg:>9.1f} {median:>9.1f} {p95:>9.1f} {p99:>9.1f}")
+    
     def print_test_summary(self, results: Dict[str, Any]):
         """Print comprehensive test summary"""
         print("\n" + "=" * 60)
@@ -306,11 +558,8 @@ class BackendTester:
         
         # Test results
         tests = [
-            ("AI LLM Integration", results["ai_llm_integration"]),
-            ("AI Image Generation", results["ai_image_generation"]),
-            ("Emergent Authentication", results["emergent_auth"]),
-            ("Content API Endpoints", results["content_api_endpoints"]),
-            ("Database Storage", results["database_storage"])
+            (TEST_NAMES.get(key, key), result)
+            for key, result in results.items() if isinstance(result, bool)
         ]
         
         passed = sum(1 for _, result in tests if result)
@@ -336,30 +585,43 @@ class BackendTester:
         # Overall assessment
         if passed == total:
             print(f"\n🎉 ALL TESTS PASSED! Backend is working correctly.")
-        elif passed >= total * 0.8:
+        elif passed >= total * PASS_RATIO:
             print(f"\n✅ MOSTLY WORKING ({passed}/{total} passed)")
         else:
             print(f"\n❌ SIGNIFICANT ISSUES ({passed}/{total} passed)")
+        
+        self.print_latency_summary()
 
 async def main():
     """Main test execution"""
-    tester = BackendTester()
-    results = await tester.run_all_tests()
+    parser = argparse.ArgumentParser(description="AI Content & Marketing Studio backend tests")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--record", dest="fixture_mode", action="store_const", const="record",
+                      help=f"record probe responses to {FIXTURES_PATH}")
+    mode.add_argument("--replay", dest="fixture_mode", action="store_const", const="replay",
+                      help="serve recorded probe responses, falling back to the network")
+    mode.add_argument("--lockdown", dest="fixture_mode", action="store_const", const="lockdown",
+                      help="serve recorded probe responses and fail on any missing fixture")
+    parser.add_argument("--max-concurrency", type=int, default=MAX_CONCURRENCY,
+                        help=f"maximum requests in flight at once (default: {MAX_CONCURRENCY})")
+    args = parser.parse_args()
+    
+    async with BackendTester(fixture_mode=args.fixture_mode, max_concurrency=args.max_concurrency) as tester:
+        results = await tester.run_all_tests()
     
-    # Return exit code based on results
-    passed_tests = sum([
-        results["ai_llm_integration"],
-        results["ai_image_generation"], 
-        results["emergent_auth"],
-        results["content_api_endpoints"],
-        results["database_storage"]
-    ])
+    # Return exit code based on results; the boolean entries are the test
+    # outcomes, so the count follows the phase table
+    passed_tests = sum(1 for value in results.values() if isinstance(value, bool) and value)
+    total = sum(1 for value in results.values() if isinstance(value, bool))
     
-    if passed_tests >= 4:  # At least 4/5 tests should pass
+    if passed_tests >= total * PASS_RATIO:
         return 0
     else:
         return 1
 
 if __name__ == "__main__":
-    exit_code = asyncio.run(main())
+    if uvloop is not None:
+        exit_code = uvloop.run(main())
+    else:
+        exit_code = asyncio.run(main())
     exit(exit_code)
\ No newline at end of file
@@ -316,6 +316,12 @@ const ContentDisplay = ({ content }) => {
     alert('Content copied to clipboard!');
   };
 
+  // Freshly generated content carries the image inline; history entries
+  // reference it and load it from the image endpoint
+  const imageSrc = content.image_base64
+    ? `data:image/png;base64,${content.image_base64}`
+    : content.image_ref && `${API}/content/${content.id}/image`;
+
   return (
     <div className="bg-white rounded-xl shadow-lg p-6">
       <div className="flex justify-between items-center mb-4">
@@ -330,10 +336,10 @@ const ContentDisplay = ({ content }) => {
         </button>
       </div>
       
-      {content.image_base64 && (
+      {imageSrc && (
         <div className="mb-6">
           <img
-            src={`data:image/png;base64,${content.image_base64}`}
+            src={imageSrc}
             alt="Generated flyer"
             className="w-full max-w-md mx-auto rounded-lg shadow-md"
           />
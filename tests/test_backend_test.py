@@ -0,0 +1,11 @@
+import json
+
+import backend_test
+
+
+def test_content_body_template_matches_dict_encoding():
+    for content_type in ["social_post", "flyer", "radio_script", "marketing_plan"]:
+        body = backend_test.CONTENT_BODY_TEMPLATE.replace(
+            backend_test.CONTENT_TYPE_SENTINEL, backend_test.json_bytes(content_type)
+        )
+        assert json.loads(body) == {**backend_test.CONTENT_TEST_DATA, "content_type": content_type}